@@ -20,53 +20,65 @@ BUILD_DIR = BASE_DIR / "build" / "linux" / "x86_64" / "release"
 # 确保输出目录存在
 OUTPUT_DIR.mkdir(exist_ok=True)
 
-# --- 核心辅助函数 ---
-
-def get_latest_file(pattern: str) -> Path | None:
-    """根据模式获取目录下最新的文件"""
-    matches = list(OUTPUT_DIR.glob(pattern))
-    if not matches:
-        return None
-    # 按修改时间排序，取最后一个
-    return max(matches, key=lambda p: p.stat().st_mtime)
-
 # --- 任务执行逻辑 ---
 
+def build_targets(names: list[str]) -> set[str]:
+    """批量构建全部目标, 返回构建失败的目标名集合。
+
+    一次 xmake 调用即可跨翻译单元并行编译 (-j), 并摊销 xmake 启动开销;
+    逐个串行构建时, 编译链才是整个扫描的主要耗时。
+    """
+    bins = [f"bench_{n}" for n in names]
+    print(f"\n🔨 批量构建 {len(bins)} 个目标 (xmake -j{os.cpu_count()})...")
+    # stdout 直接丢弃而非 capture_output 缓冲进内存,
+    # stderr 保持直通终端, 编译错误实时可见
+    result = subprocess.run(
+        ["xmake", "build", "-j", str(os.cpu_count()), *bins],
+        cwd=BASE_DIR, stdout=subprocess.DEVNULL
+    )
+    if result.returncode == 0:
+        return set()
+
+    # 批量构建失败时逐个重试, 定位具体失败的目标
+    failed = set()
+    for name, target_bin in zip(names, bins):
+        if subprocess.run(["xmake", "build", target_bin], cwd=BASE_DIR, stdout=subprocess.DEVNULL).returncode != 0:
+            print(f"   ❌ 构建失败: {target_bin}")
+            failed.add(name)
+    return failed
+
+def needs_roudi(name: str) -> bool:
+    return "iox" in name
+
+def start_roudi():
+    """启动整个扫描共享的 iox-roudi 守护进程。
+
+    RouDi 可同时服务多个 iceoryx 应用, 按目标反复启动/杀死只是
+    在每个 iox 目标上白付 1.5s 的启动等待。
+    """
+    print("\n🛰️ 启动 iox-roudi 环境...")
+    f_log = open(BASE_DIR / "roudi.log", "w")
+    proc = subprocess.Popen(["sudo", "iox-roudi"], stdout=f_log, stderr=subprocess.STDOUT)
+    time.sleep(1.5)
+    return proc
+
+def stop_roudi(roudi_proc):
+    print("\n[清理] 正在关闭 iox-roudi...")
+    subprocess.run(["sudo", "pkill", "-x", "iox-roudi"], check=False)
+    roudi_proc.terminate()
+
 def run_single_bench(name: str):
     target_bin = f"bench_{name}"
     exec_path = BUILD_DIR / target_bin
-    needs_roudi = ("iox" in name) 
 
     print(f"\n🚀 开始执行测试目标: {name}")
 
-    # A. 编译 (xmake)
-    print(f"   [1/3] 构建中...")
-    if subprocess.run(["xmake", "build", target_bin], cwd=BASE_DIR, capture_output=True).returncode != 0:
-        print(f"   ❌ 构建失败: {target_bin}")
-        return
-
-    # B. 运行 (考虑 RouDi 环境)
-    roudi_proc = None
+    # A. 运行
     try:
-        if needs_roudi:
-            print("   [2/3] 启动 iox-roudi 环境...")
-            f_log = open(BASE_DIR / "roudi.log", "w")
-            roudi_proc = subprocess.Popen(["sudo", "iox-roudi"], stdout=f_log, stderr=subprocess.STDOUT)
-            time.sleep(1.5)
-
-        print("   [3/3] 运行测试二进制程序...")
+        print("   [运行] 运行测试二进制程序...")
         subprocess.run(["sudo", str(exec_path)], check=True, cwd=BASE_DIR)
     except Exception as e:
         print(f"   ❌ 运行时出错: {e}")
-    finally:
-        if roudi_proc:
-            print("   [清理] 正在关闭 iox-roudi...")
-            subprocess.run(["sudo", "pkill", "-x", "iox-roudi"], check=False)
-            roudi_proc.terminate()
-
-    # C. 自动分析最新生成的 CSV
-    print(f"   [报告] 启动分析脚本...")
-    subprocess.run([sys.executable, "scripts/gen_report.py", name], cwd=BASE_DIR)
 
 def main():
     # 获取目录下的全部可选项
@@ -89,19 +101,54 @@ def main():
     # 提权一次 sudo
     subprocess.run(["sudo", "-v"], check=True)
 
-    for target in run_list:
+    # 先并行构建全部目标, 运行阶段保持串行以保证计时准确
+    build_failed = build_targets(run_list)
+    todo_list = [t for t in run_list if t not in build_failed]
+
+    # 按是否依赖 RouDi 分组: 普通目标在无后台守护进程的环境下先跑
+    # (ns 级计时容不下多余噪声), RouDi 只在 iox 段存活且只启动一次
+    plain_targets = [t for t in todo_list if not needs_roudi(t)]
+    iox_targets = [t for t in todo_list if needs_roudi(t)]
+
+    for target in plain_targets:
         run_single_bench(target)
 
+    if iox_targets:
+        roudi_proc = start_roudi()
+        try:
+            for target in iox_targets:
+                run_single_bench(target)
+        finally:
+            stop_roudi(roudi_proc)
+
+    # 全部运行结束后并行生成报告:
+    # 分析纯 CPU 密集且互不相干, 没必要挤占基准运行之间的串行窗口
+    print("\n[报告] 并行生成全部报告...")
+    report_procs = [
+        (t, subprocess.Popen([sys.executable, "scripts/gen_report.py", t], cwd=BASE_DIR))
+        for t in todo_list
+    ]
+    for t, proc in report_procs:
+        if proc.wait() != 0:
+            print(f"   ❌ 报告生成失败: {t}")
+
     # 汇总展示
     print("\n" + "="*50)
     print("📊 最终状态汇总")
+    # 单次目录扫描建立 目标 -> 最新 JSON 的索引,
+    # 避免逐目标对 outputs/ 重复 glob
+    latest_json: dict[str, str] = {}
+    for p in sorted(OUTPUT_DIR.glob("*.json"), key=lambda p: p.name):
+        for t in run_list:
+            if p.name.startswith(t):
+                latest_json[t] = p.name
     summary = []
     for t in run_list:
-        json_file = get_latest_file(f"{t}*.json") # 同样更新这里的查找逻辑
+        json_file = latest_json.get(t)
         summary.append({
             "Target": t,
             "Status": "✅" if json_file else "❌",
-            "Latest_Data": json_file.name if json_file else "N/A"
+            "Latest_Data": json_file if json_file else "N/A"
         })
     print(pl.DataFrame(summary))
     print("="*50)
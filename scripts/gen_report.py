@@ -2,6 +2,7 @@ import argparse
 import sys
 from pathlib import Path
 
+import numpy as np
 import polars as pl
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
@@ -10,12 +11,19 @@ from plotly.subplots import make_subplots
 BASE_DIR = Path(__file__).resolve().parent.parent
 OUTPUT_DIR = BASE_DIR / "outputs"
 
+# 直方图子图最多绘制的柱数 (HdrHistogram 原始桶可能有数万个)
+DISPLAY_BINS = 1000
+
 def get_latest_file(pattern: str) -> Path | None:
-    """根据模式获取目录下最新的文件"""
+    """根据模式获取目录下最新的文件。
+
+    Recorder 导出的文件名内嵌零填充的 YYYY-MM-DD-HH:MM:SS 时间戳,
+    字典序即时间序, 直接按文件名取最大值, 免去逐文件 stat() 系统调用。
+    """
     matches = list(OUTPUT_DIR.glob(pattern))
     if not matches:
         return None
-    return max(matches, key=lambda p: p.stat().st_mtime)
+    return max(matches, key=lambda p: p.name)
 
 def generate_report(name: str):
     """动态定位最新的直方图 CSV 并生成 Plotly HTML 报告"""
@@ -31,24 +39,36 @@ def generate_report(name: str):
     output_html = OUTPUT_DIR / f"{csv_path.name}_report.html"
     
     try:
-        # 1. 加载并计算统计量
-        df = pl.read_csv(csv_path).sort("value_ns")
-        total_count = df["count"].sum()
+        # 1. 惰性扫描 CSV 并流式计算统计量
+        # 单次向量化遍历即可得到 CDF, 避免大 CSV 的峰值内存尖刺
+        lf = pl.scan_csv(
+            csv_path, schema={"value_ns": pl.Float64, "count": pl.UInt64}
+        )
+        lf_cdf = lf.sort("value_ns").with_columns(
+            (pl.col("count").cum_sum() / pl.col("count").sum()).alias("cdf")
+        )
+        # 总数与加权和并入同一查询计划, collect_all 共享一次 CSV 扫描,
+        # 省去物化 value_ns*count 中间列的额外遍历
+        lf_stats = lf.select(
+            pl.col("count").sum().alias("N"),
+            (pl.col("value_ns") * pl.col("count")).sum().alias("S"),
+        )
+        df, stats = pl.collect_all([lf_cdf, lf_stats], engine="streaming")
+        total_count = stats["N"][0]
         if total_count == 0:
             print("   [跳过] 数据集样本数为 0")
             return
 
         # 计算全数据均值
-        full_mean = (df["value_ns"] * df["count"]).sum() / total_count
-        
-        # 计算全数据 CDF
-        df = df.with_columns(
-            (pl.col("count").cum_sum() / total_count).alias("cdf")
-        )
-        
-        # 计算关键百分位数
-        full_p50 = df.filter(pl.col("cdf") >= 0.5).head(1)["value_ns"].item()
-        p99_val = df.filter(pl.col("cdf") >= 0.99).head(1)["value_ns"].item()
+        full_mean = stats["S"][0] / total_count
+
+        # 在单调的 CDF 上二分定位关键百分位数, 取代整表过滤;
+        # 两个分位数合并为一次向量化查找
+        cdf_arr = df["cdf"].to_numpy()
+        values_arr = df["value_ns"].to_numpy()
+        p50_idx, p99_idx = np.searchsorted(cdf_arr, [0.5, 0.99], side="left")
+        full_p50 = values_arr[p50_idx]
+        p99_val = values_arr[p99_idx]
         
         # 打印分析汇总
         print(f"   [统计] 样本总数: {total_count}")
@@ -59,6 +79,11 @@ def generate_report(name: str):
         # 过滤用于绘图的数据 (仅限 P99)
         df_plot = df.filter(pl.col("value_ns") <= p99_val)
 
+        # 一次性转换供各 trace 复用, 避免 plotly 内部的隐式重复转换
+        # (流式 collect 的列在大输入下是多块的, 不能强制零拷贝)
+        x_plot = df_plot["value_ns"].to_numpy()
+        cdf_plot = df_plot["cdf"].to_numpy()
+
         # 2. 创建 2 行 1 列子图
         fig = make_subplots(
             rows=2, cols=1,
@@ -72,17 +97,32 @@ def generate_report(name: str):
         # --- 图表 1: CDF ---
         fig.add_trace(
             go.Scatter(
-                x=df_plot["value_ns"], y=df_plot["cdf"], 
-                mode='lines', name='CDF', 
+                x=x_plot, y=cdf_plot,
+                mode='lines', name='CDF',
                 line=dict(width=3, color='#1f77b4')
             ),
             row=1, col=1
         )
 
         # --- 图表 2: 直方图 ---
+        # HdrHistogram 在低值区的桶非常细, 逐桶画 Bar 会产生上万个图元;
+        # 先在 Polars 中重分箱到不超过 DISPLAY_BINS 个等宽显示桶
+        lo = df_plot["value_ns"].min()
+        bin_width = max((p99_val - lo) / DISPLAY_BINS, 1e-6)
+        df_bar = (
+            df_plot.group_by(
+                ((pl.col("value_ns") - lo) // bin_width).alias("bin")
+            )
+            .agg(pl.col("count").sum())
+            .sort("bin")
+            .with_columns(
+                ((pl.col("bin") + 0.5) * bin_width + lo).alias("value_ns")
+            )
+        )
         fig.add_trace(
             go.Bar(
-                x=df_plot["value_ns"], y=df_plot["count"], 
+                x=df_bar["value_ns"], y=df_bar["count"],
+                width=bin_width,
                 name='Count', marker_color='#00CC96'
             ),
             row=2, col=1
@@ -119,7 +159,10 @@ def generate_report(name: str):
         fig.update_yaxes(title_text="Probability", range=[0, 1.0], row=1, col=1)
         fig.update_yaxes(title_text="Count", row=2, col=1)
         
-        fig.write_html(str(output_html))
+        # 从 CDN 引用 plotly.js, 不往每份报告里内嵌 ~3MB 的脚本;
+        # trace 全部由本脚本构造, validate=False 跳过整图的递归重校验
+        html = fig.to_html(include_plotlyjs="cdn", validate=False)
+        output_html.write_text(html, encoding="utf-8")
         print(f"   [成功] 报告已保存至: {output_html.resolve()}")
 
     except Exception as e:
@@ -26,12 +26,21 @@ raw_data = [
 ]
 
 # 2. 数据处理
-df = pl.DataFrame(raw_data, schema=["Scenario", "DataSize", "BufSize", "Latency_ns"])
+# 尺寸列用有序 Enum 编码: 排序与 X 轴顺序直接由类别序决定,
+# 不再用正则抽数字生成辅助排序列 (避免 32B 排在 8B 前面)
+BUF_ORDER = ["2B", "8B", "32B", "64B", "512B", "4096B"]
+DATA_ORDER = ["64B", "256B", "1024B"]
 
-# 提取 BufSize 中的数字用于物理排序 (避免 32B 排在 8B 前面)
-df = df.with_columns(
-    pl.col("BufSize").str.extract(r"(\d+)", 1).cast(pl.Int64).alias("Buf_int")
-).sort(["Scenario", "DataSize", "Buf_int"])
+df = pl.from_records(
+    raw_data,
+    schema={
+        "Scenario": pl.Categorical,
+        "DataSize": pl.Enum(DATA_ORDER),
+        "BufSize": pl.Enum(BUF_ORDER),
+        "Latency_ns": pl.Float64,
+    },
+    orient="row",
+).sort(["Scenario", "DataSize", "BufSize"])
 
 # 3. 绘图：多维度对比
 fig = px.line(
@@ -48,5 +57,5 @@ fig = px.line(
 )
 
 # 统一 X 轴排序并优化显示
-fig.update_xaxes(categoryorder="array", categoryarray=df.sort("Buf_int")["BufSize"].unique().to_list())
+fig.update_xaxes(categoryorder="array", categoryarray=BUF_ORDER)
 fig.show()
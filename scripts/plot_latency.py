@@ -0,0 +1,246 @@
+import argparse
+from pathlib import Path
+
+import numpy as np
+import polars as pl
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+# --- 路径配置 ---
+BASE_DIR = Path(__file__).resolve().parent.parent
+OUTPUT_DIR = BASE_DIR / "outputs"
+
+# 聚合桶宽 (ns): 绘图只有不到 1000 个可见像素, 不需要逐样本精度
+BIN_WIDTH_NS = 1
+
+# 时间序列最多绘制的点数, 超出后按步长降采样
+TS_MAX_POINTS = 2000
+
+def get_latest_file(pattern: str) -> Path | None:
+    """根据模式获取目录下最新的文件。
+
+    Recorder 导出的文件名内嵌零填充的 YYYY-MM-DD-HH:MM:SS 时间戳,
+    字典序即时间序, 直接按文件名取最大值, 免去逐文件 stat() 系统调用。
+    """
+    matches = list(OUTPUT_DIR.glob(pattern))
+    if not matches:
+        return None
+    return max(matches, key=lambda p: p.name)
+
+def add_kde_trace(fig, data: np.ndarray, row: int, col: int,
+                  weights: np.ndarray | None = None):
+    """向子图添加基于 FFT 卷积的高斯核密度估计 (KDE) 曲线。
+
+    scipy.stats.gaussian_kde 在每个求值点上遍历全部样本, 是 O(N*M) 的
+    标量循环, 样本上百万时会拖垮报告生成。这里先把样本压到 4096 格的
+    细直方图上, 再与高斯核做 FFT 卷积, 复杂度降为 O(N + G log G)。
+
+    传入 weights 时 data 视为桶中心, weights 为各桶计数,
+    直接对预聚合分布做加权 KDE。
+    """
+    if weights is None:
+        n = len(data)
+        std = data.std()
+        q25, q75 = np.percentile(data, [25, 75])
+    else:
+        n = weights.sum()
+        mean = np.average(data, weights=weights)
+        std = np.sqrt(np.average((data - mean) ** 2, weights=weights))
+        cw = np.cumsum(weights) / n
+        q25, q75 = data[np.searchsorted(cw, [0.25, 0.75])]
+
+    # Silverman 经验法则带宽: 取 std 与 IQR/1.34 的较小者,
+    # 对延迟这类重尾分布比单用 std 更稳健
+    spread = min(std, (q75 - q25) / 1.34) if q75 > q25 else std
+    sigma = 0.9 * spread * n ** -0.2
+    if sigma <= 0:
+        return
+
+    bins = 4096
+    lo, hi = float(data.min()), float(data.max())
+    hist, edges = np.histogram(data, bins=bins, range=(lo, hi),
+                               weights=weights, density=True)
+    grid = 0.5 * (edges[:-1] + edges[1:])
+    dx = edges[1] - edges[0]
+
+    # 高斯核采样在同一网格间距上, 支撑截断到 ±8σ:
+    # 之外的权重可忽略, FFT 长度随核宽缩短而显著变小
+    half_width = min(bins // 2, int(np.ceil(8 * sigma / dx)))
+    offsets = np.arange(-half_width, half_width + 1) * dx
+    kernel = np.exp(-0.5 * (offsets / sigma) ** 2)
+    kernel /= kernel.sum()
+
+    # 零填充到线性卷积长度后做 FFT 卷积, 再裁回 'same' 区间
+    n_fft = bins + len(kernel) - 1
+    density = np.fft.irfft(
+        np.fft.rfft(hist, n=n_fft) * np.fft.rfft(kernel, n=n_fft), n=n_fft
+    )[half_width:half_width + bins]
+
+    # 插值到 500 点输出网格, 足够绘图精度
+    xs = np.linspace(lo, hi, 500)
+    ys = np.interp(xs, grid, density)
+    fig.add_trace(
+        go.Scatter(
+            x=xs, y=ys,
+            mode='lines', name='KDE',
+            line=dict(width=2, color='#EF553B')
+        ),
+        row=row, col=col
+    )
+
+def plot_and_save_all(name: str):
+    """动态定位最新的逐样本延迟 CSV (latency_ns 列) 并生成 Plotly HTML 报告"""
+    csv_path = get_latest_file(f"{name}*.csv")
+
+    if not csv_path:
+        print(f"   [错误] 未能在 {OUTPUT_DIR} 找到匹配 '{name}*.csv' 的数据文件")
+        return
+
+    print(f"   [数据源] {csv_path.resolve()}")
+
+    output_html = OUTPUT_DIR / f"{csv_path.name}_latency.html"
+
+    try:
+        # 1. 流式扫描 CSV 并聚合到固定宽度的桶
+        # 不物化整个 latency_ns 列: 绘图成本从此与样本数无关,
+        # 与 gen_report.py 消费的 HdrHistogram 分布走同一条路径
+        # 显式声明列类型, 省去 polars 的类型推断预扫描;
+        # select 投影只读 latency_ns 一列
+        buckets = (
+            pl.scan_csv(csv_path, schema_overrides={"latency_ns": pl.Float64})
+            .select((pl.col("latency_ns") // BIN_WIDTH_NS).cast(pl.Int64).alias("bucket"))
+            .group_by("bucket")
+            .agg(pl.len().alias("count"))
+            .sort("bucket")
+            .collect(engine="streaming")
+        )
+        # 流式 collect 的结果在大输入下是多块列, 不能强制零拷贝;
+        # 相对后续计算, 这次复制可以忽略
+        centers = (buckets["bucket"].to_numpy() + 0.5) * BIN_WIDTH_NS
+        counts = buckets["count"].to_numpy()
+        total_count = int(counts.sum())
+        if total_count == 0:
+            print("   [跳过] 数据集样本数为 0")
+            return
+
+        # 从累积计数求均值与分位数 (同 gen_report.py)
+        full_mean = (centers * counts).sum() / total_count
+        cdf = np.cumsum(counts) / total_count
+        full_p50 = centers[np.searchsorted(cdf, 0.5)]
+        p99_val = centers[np.searchsorted(cdf, 0.99)]
+
+        print(f"   [统计] 样本总数: {total_count}")
+        print(f"   [统计] 全局均值: {full_mean:.2f} ns")
+        print(f"   [统计] 全局 P50 : {full_p50:.2f} ns")
+        print(f"   [统计] 全局 P99 : {p99_val:.2f} ns (绘图截断点)")
+
+        # 过滤用于绘图的数据 (仅限 P99)
+        plot_mask = centers <= p99_val
+        centers_plot = centers[plot_mask]
+        counts_plot = counts[plot_mask]
+
+        # 2. 创建 3 行 1 列子图
+        fig = make_subplots(
+            rows=3, cols=1,
+            subplot_titles=(
+                "1. Time Series",
+                "2. Latency Distribution (Histogram) - Restricted to P99 Range",
+                "3. Density (KDE) - Restricted to P99 Range"
+            ),
+            vertical_spacing=0.1
+        )
+
+        # --- 图表 1: 时间序列 (min/max 包络降采样) ---
+        # 折线横向只有约 2000 个可见像素, 但等距抽样会丢掉延迟尖刺
+        # (尖刺正是时间序列最需要看的); 按步长分桶取每桶 min/max,
+        # 包络带与逐样本折线视觉等价, 且不会漏掉任何离群点
+        step = max(1, total_count // TS_MAX_POINTS)
+        env = (
+            pl.scan_csv(csv_path, schema_overrides={"latency_ns": pl.Float64})
+            .select("latency_ns")
+            .with_row_index("seq")
+            .group_by((pl.col("seq") // step).alias("bucket"))
+            .agg(
+                pl.col("latency_ns").min().alias("lo"),
+                pl.col("latency_ns").max().alias("hi"),
+            )
+            .sort("bucket")
+            .collect(engine="streaming")
+        )
+        ts_x = env["bucket"].to_numpy() * step
+        fig.add_trace(
+            go.Scatter(
+                x=ts_x, y=env["lo"].to_numpy(),
+                mode='lines', name='Min',
+                line=dict(width=1, color='#1f77b4')
+            ),
+            row=1, col=1
+        )
+        fig.add_trace(
+            go.Scatter(
+                x=ts_x, y=env["hi"].to_numpy(),
+                mode='lines', name='Max',
+                line=dict(width=1, color='#1f77b4'),
+                fill='tonexty', fillcolor='rgba(31, 119, 180, 0.3)'
+            ),
+            row=1, col=1
+        )
+
+        # --- 图表 2: 直方图 (预聚合桶) ---
+        fig.add_trace(
+            go.Bar(
+                x=centers_plot, y=counts_plot, width=BIN_WIDTH_NS,
+                name='Count', marker_color='#00CC96'
+            ),
+            row=2, col=1
+        )
+
+        # --- 图表 3: 加权 KDE ---
+        add_kde_trace(fig, centers_plot, row=3, col=1, weights=counts_plot)
+
+        # --- 添加辅助线 (Mean 和 P50) ---
+        for r in [2, 3]:
+            fig.add_vline(
+                x=full_mean, line_dash="dash", line_color="red",
+                annotation_text=f"Mean: {full_mean:.1f}ns",
+                annotation_position="top right",
+                row=r, col=1
+            )
+            fig.add_vline(
+                x=full_p50, line_dash="dot", line_color="orange",
+                annotation_text=f"P50: {full_p50:.1f}ns",
+                annotation_position="top right",
+                row=r, col=1
+            )
+
+        # 3. 布局设置
+        fig.update_layout(
+            height=1200,
+            title_text=f"Benchmark: {name} | Data: {csv_path.name}",
+            template="plotly_white",
+            showlegend=False,
+            bargap=0
+        )
+
+        fig.update_xaxes(title_text="Sample Index", row=1, col=1)
+        fig.update_xaxes(title_text="Latency (ns)", row=2, col=1)
+        fig.update_xaxes(title_text="Latency (ns)", row=3, col=1)
+        fig.update_yaxes(title_text="Latency (ns)", row=1, col=1)
+        fig.update_yaxes(title_text="Count", row=2, col=1)
+        fig.update_yaxes(title_text="Density", row=3, col=1)
+
+        # 从 CDN 引用 plotly.js, 不往每份报告里内嵌 ~3MB 的脚本;
+        # trace 全部由本脚本构造, validate=False 跳过整图的递归重校验
+        html = fig.to_html(include_plotlyjs="cdn", validate=False)
+        output_html.write_text(html, encoding="utf-8")
+        print(f"   [成功] 报告已保存至: {output_html.resolve()}")
+
+    except Exception as e:
+        print(f"   [异常] 生成报告时出错: {e}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Raw latency sample report generator")
+    parser.add_argument("name", type=str, help="Target benchmark name")
+    args = parser.parse_args()
+
+    plot_and_save_all(args.name)